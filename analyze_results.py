@@ -0,0 +1,827 @@
+#!/usr/bin/env python3
+"""
+UAV Swarm Simulation - Results Analyzer
+========================================
+
+Parses OMNeT++ scalar result files (.sca) from simulations/results/ and
+generates summary statistics plus publication-quality graphs for the
+routing/telemetry KPIs tracked by the swarm (route discoveries, packets
+routed per drone).
+
+Usage:
+    ./analyze_results.py                         # analyze simulations/results
+    ./analyze_results.py --results-dir path/     # custom results directory
+    ./analyze_results.py --output-dir analysis/  # where PNGs are written
+
+Author: Rodrigo Paczkovski
+Repository: github.com/ropacz/drone-swarm
+"""
+
+import argparse
+import array
+import csv
+import functools
+import gc
+import hashlib
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+try:  # optional: JIT-compiled byte scanner, ~an order faster than the regex
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:  # optional: pandas C tokenizer as a fast path when numba is absent
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# matplotlib is imported lazily by GraphGenerator: parsing-only runs
+# (--no-plots, --help, bad results dir) never pay its ~400 ms import cost.
+plt = None
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+RESULTS_DIR = "simulations/results"
+OUTPUT_DIR = "analysis"
+CACHE_DIR = OUTPUT_DIR + "/.cache"
+
+FIGURE_SIZE = (12, 7)
+FIGURE_DPI = 300
+
+# Single pre-compiled pattern run over the whole memory-mapped file.  One
+# re.finditer pass over kernel-mapped bytes keeps the parse compute-bound on
+# the regex engine (C) instead of a Python line loop with per-line split().
+_SCA_RE = re.compile(
+    rb"^scalar\s+\S*?drone\[(\d+)\]\S*\s+(\S+)\s+([-+0-9.eE]+)",
+    re.MULTILINE,
+)
+
+# Only these scalars feed the summary and the plots; OMNeT++ emits dozens of
+# others per module (queue lengths, radio states, ...) that every parse path
+# skips before converting the value.
+_WANTED = frozenset({
+    b"routeDiscovered:count",
+    b"packetRouted:count",
+    b"routeDiscovered:sum",
+    b"packetRouted:sum",
+})
+
+# The same names in a padded uint8 matrix so the Numba scanner can compare
+# byte spans against them without creating Python objects.
+_WANTED_LEN = np.array([len(n) for n in sorted(_WANTED)], dtype=np.int64)
+_WANTED_MAT = np.zeros((len(_WANTED), int(_WANTED_LEN.max())), dtype=np.uint8)
+for _i, _n in enumerate(sorted(_WANTED)):
+    _WANTED_MAT[_i, :len(_n)] = np.frombuffer(_n, dtype=np.uint8)
+
+
+def _atof_impl(buf, lo, hi):
+    """Parse buf[lo:hi] as a float. Returns (value, ok)."""
+    i = lo
+    sign = 1.0
+    if i < hi and (buf[i] == 43 or buf[i] == 45):  # '+' / '-'
+        if buf[i] == 45:
+            sign = -1.0
+        i += 1
+    mantissa = 0.0
+    digits = 0
+    while i < hi and 48 <= buf[i] <= 57:
+        mantissa = mantissa * 10.0 + (buf[i] - 48)
+        digits += 1
+        i += 1
+    frac_exp = 0
+    if i < hi and buf[i] == 46:  # '.'
+        i += 1
+        while i < hi and 48 <= buf[i] <= 57:
+            mantissa = mantissa * 10.0 + (buf[i] - 48)
+            frac_exp -= 1
+            digits += 1
+            i += 1
+    if digits == 0:
+        return 0.0, False
+    exp = 0
+    if i < hi and (buf[i] == 101 or buf[i] == 69):  # 'e' / 'E'
+        i += 1
+        exp_sign = 1
+        if i < hi and (buf[i] == 43 or buf[i] == 45):
+            if buf[i] == 45:
+                exp_sign = -1
+            i += 1
+        exp_digits = 0
+        while i < hi and 48 <= buf[i] <= 57:
+            exp = exp * 10 + (buf[i] - 48)
+            exp_digits += 1
+            i += 1
+        if exp_digits == 0:
+            return 0.0, False
+        exp *= exp_sign
+    if i != hi:
+        return 0.0, False
+    return sign * mantissa * 10.0 ** (exp + frac_exp), True
+
+
+def _scan_bytes_impl(buf):
+    """State-machine scanner over a uint8 view of one .sca file.
+
+    Walks the buffer line by line looking for
+    ``scalar <module-with-drone[N]> <name> <value>`` records without any
+    Python-level string objects, so Numba can compile the whole loop.
+    Returns (drones, values, name_lo, name_hi); the caller slices the
+    scalar-name bytes out of the buffer afterwards.
+    """
+    n = buf.shape[0]
+    cap = 4096
+    drones = np.empty(cap, np.int32)
+    values = np.empty(cap, np.float64)
+    name_lo = np.empty(cap, np.int64)
+    name_hi = np.empty(cap, np.int64)
+    count = 0
+    i = 0
+    while i < n:
+        line_end = i
+        while line_end < n and buf[line_end] != 10:  # '\n'
+            line_end += 1
+        # "scalar " prefix
+        if (line_end - i > 7 and buf[i] == 115 and buf[i + 1] == 99
+                and buf[i + 2] == 97 and buf[i + 3] == 108
+                and buf[i + 4] == 97 and buf[i + 5] == 114
+                and buf[i + 6] == 32):
+            p = i + 7
+            while p < line_end and (buf[p] == 32 or buf[p] == 9):
+                p += 1
+            mod_end = p
+            while mod_end < line_end and buf[mod_end] != 32 and buf[mod_end] != 9:
+                mod_end += 1
+            # "drone[N]" inside the module path
+            drone_id = -1
+            q = p
+            while q + 6 <= mod_end:
+                if (buf[q] == 100 and buf[q + 1] == 114 and buf[q + 2] == 111
+                        and buf[q + 3] == 110 and buf[q + 4] == 101
+                        and buf[q + 5] == 91):
+                    r = q + 6
+                    d = 0
+                    got = False
+                    while r < mod_end and 48 <= buf[r] <= 57:
+                        d = d * 10 + (buf[r] - 48)
+                        got = True
+                        r += 1
+                    if got and r < mod_end and buf[r] == 93:  # ']'
+                        drone_id = d
+                    break
+                q += 1
+            if drone_id >= 0:
+                nm_lo = mod_end
+                while nm_lo < line_end and (buf[nm_lo] == 32 or buf[nm_lo] == 9):
+                    nm_lo += 1
+                nm_hi = nm_lo
+                while nm_hi < line_end and buf[nm_hi] != 32 and buf[nm_hi] != 9:
+                    nm_hi += 1
+                # early exit for the many scalars nothing downstream reads
+                wanted = False
+                for w in range(_WANTED_MAT.shape[0]):
+                    if nm_hi - nm_lo == _WANTED_LEN[w]:
+                        match = True
+                        for k in range(_WANTED_LEN[w]):
+                            if buf[nm_lo + k] != _WANTED_MAT[w, k]:
+                                match = False
+                                break
+                        if match:
+                            wanted = True
+                            break
+                if not wanted:
+                    i = line_end + 1
+                    continue
+                v_lo = nm_hi
+                while v_lo < line_end and (buf[v_lo] == 32 or buf[v_lo] == 9):
+                    v_lo += 1
+                v_hi = v_lo
+                while (v_hi < line_end and buf[v_hi] != 32 and buf[v_hi] != 9
+                        and buf[v_hi] != 13):  # '\r'
+                    v_hi += 1
+                value, ok = _atof_impl(buf, v_lo, v_hi)
+                if ok and nm_hi > nm_lo:
+                    if count == cap:
+                        cap *= 2
+                        new_drones = np.empty(cap, np.int32)
+                        new_drones[:count] = drones
+                        drones = new_drones
+                        new_values = np.empty(cap, np.float64)
+                        new_values[:count] = values
+                        values = new_values
+                        new_lo = np.empty(cap, np.int64)
+                        new_lo[:count] = name_lo
+                        name_lo = new_lo
+                        new_hi = np.empty(cap, np.int64)
+                        new_hi[:count] = name_hi
+                        name_hi = new_hi
+                    drones[count] = drone_id
+                    values[count] = value
+                    name_lo[count] = nm_lo
+                    name_hi[count] = nm_hi
+                    count += 1
+        i = line_end + 1
+    return drones[:count], values[:count], name_lo[:count], name_hi[:count]
+
+
+if njit is not None:
+    _atof_impl = njit(cache=True)(_atof_impl)
+    _scan_bytes = njit(cache=True)(_scan_bytes_impl)
+else:
+    _scan_bytes = None
+
+
+def _parse_sca_pandas(path):
+    """Parse one .sca file with the pandas C tokenizer.
+
+    .sca scalar records are whitespace-delimited ``scalar module name
+    value`` lines, so one read_csv call filters and splits the whole file
+    in C; the drone id comes out of a single vectorized str.extract.
+    """
+    df = pd.read_csv(
+        path, sep=r"\s+", engine="c", header=None, comment="#",
+        usecols=[0, 1, 2, 3], names=["kind", "module", "scalar", "value"],
+        dtype=str, on_bad_lines="skip", quoting=csv.QUOTE_NONE)
+    df = df[(df["kind"] == "scalar")
+            & df["scalar"].isin([n.decode() for n in _WANTED])]
+    drone = df["module"].str.extract(r"drone\[(\d+)\]", expand=False)
+    value = pd.to_numeric(df["value"], errors="coerce")
+    mask = drone.notna() & value.notna() & df["scalar"].notna()
+    return (
+        df.loc[mask, "scalar"].to_numpy(dtype=bytes),
+        drone[mask].to_numpy(dtype=np.int32),
+        value[mask].to_numpy(dtype=np.float64),
+    )
+
+
+def _parse_sca_file(path):
+    """Parse one .sca file with a single compiled-regex pass over mmap.
+
+    Prefers the Numba byte scanner, then the pandas C tokenizer, then the
+    regex; module-level (not a method) so ProcessPoolExecutor can pickle
+    it. Returns parallel (names, drones, values) arrays, empty if the file
+    has no matching scalars.
+    """
+    if pd is not None and _scan_bytes is None:
+        return _parse_sca_pandas(path)
+    if _scan_bytes is not None:
+        # One bulk read instead of mmap here: the JIT dispatcher can hold a
+        # reference to the argument array, which would make closing the
+        # mapping fail with BufferError.
+        raw = np.fromfile(path, dtype=np.uint8)
+        drone_arr, value_arr, name_lo, name_hi = _scan_bytes(raw)
+        name_arr = np.array(
+            [raw[lo:hi].tobytes() for lo, hi in zip(name_lo, name_hi)],
+            dtype=bytes)
+        return name_arr, drone_arr, value_arr
+
+    names = []
+    drones = array.array("i")
+    values = array.array("d")
+
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            buf = None
+        if buf is not None:
+            try:
+                for m in _SCA_RE.finditer(buf):
+                    name = m.group(2)
+                    if name not in _WANTED:
+                        continue
+                    drones.append(int(m.group(1)))
+                    names.append(name)
+                    values.append(float(m.group(3)))
+            finally:
+                buf.close()
+
+    return (
+        np.array(names, dtype=bytes),
+        np.frombuffer(drones, dtype=np.int32),
+        np.frombuffer(values, dtype=np.float64),
+    )
+
+
+class SimulationAnalyzer:
+    """Loads .sca scalar files and aggregates per-drone metrics."""
+
+    def __init__(self, results_dir=RESULTS_DIR, cache_dir=CACHE_DIR):
+        self.results_dir = Path(results_dir)
+        # Parsed-array cache on disk; None disables it.
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        # SoA layout: data[scalar_name] -> {"values": float32 ndarray,
+        # "drones": int32 ndarray} (parallel arrays, one entry per sample).
+        self.data = {}
+        self.files_loaded = 0
+        # Memoized results keyed by metric name; get_metric_stats is called
+        # again by print_summary and _per_drone_stats by every plot method,
+        # so repeated lookups must not redo the full-array reductions.
+        self._stats_cache = {}
+        self._per_drone_cache = {}
+
+    def _merge(self, results):
+        """Group per-file (names, drones, values) arrays into self.data.
+
+        Concatenates all files, then builds the per-metric SoA arrays with a
+        single np.unique + np.split pass instead of a per-sample dict lookup.
+        """
+        self.files_loaded = sum(1 for names, _, _ in results if len(names))
+        names = np.concatenate([r[0] for r in results])
+        drones = np.concatenate([r[1] for r in results])
+        # float32 is plenty for .sca counts/sums and halves the memory
+        # bandwidth of every downstream reduction.
+        values = np.concatenate([r[2] for r in results]).astype(np.float32)
+
+        self.data = {}
+        if len(names):
+            uniq, inverse = np.unique(names, return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            split_points = np.cumsum(np.bincount(inverse))[:-1]
+            drones_by_metric = np.split(drones[order], split_points)
+            values_by_metric = np.split(values[order], split_points)
+            for name, metric_drones, metric_values in zip(
+                uniq, drones_by_metric, values_by_metric
+            ):
+                metric = name.decode()
+                if metric.endswith(":count"):
+                    # counts are nonnegative integers; int32 keeps them
+                    # exact and makes bincount aggregation natural
+                    metric_values = metric_values.astype(np.int32)
+                self.data[metric] = {
+                    "values": metric_values,
+                    "drones": metric_drones,
+                }
+        self._stats_cache.clear()
+        self._per_drone_cache.clear()
+
+    def _cache_path(self, files):
+        """Cache file for this input set, keyed by name/mtime/size."""
+        if self.cache_dir is None:
+            return None
+        stamp = repr([(p.name, p.stat().st_mtime_ns, p.stat().st_size)
+                      for p in files])
+        key = hashlib.blake2b(stamp.encode()).hexdigest()[:16]
+        return self.cache_dir / f"{key}.npz"
+
+    def _load_cache(self, cache_path):
+        """Restore self.data from an .npz written by _save_cache."""
+        with np.load(cache_path) as npz:
+            data = {}
+            for key in npz.files:
+                if key.endswith(".values"):
+                    metric = key[:-len(".values")]
+                    data[metric] = {
+                        "values": npz[key],
+                        "drones": npz[metric + ".drones"],
+                    }
+            self.files_loaded = int(npz["__files_loaded__"])
+        self.data = data
+        self._stats_cache.clear()
+        self._per_drone_cache.clear()
+
+    def _save_cache(self, cache_path):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {"__files_loaded__": np.int64(self.files_loaded)}
+        for metric, entry in self.data.items():
+            arrays[metric + ".values"] = entry["values"]
+            arrays[metric + ".drones"] = entry["drones"]
+        np.savez_compressed(cache_path, **arrays)
+
+    def load_all_sca_files(self, pattern="*.sca"):
+        """Load every .sca file in the results directory, in parallel.
+
+        A fresh parse of the same unmodified files is skipped entirely: the
+        merged arrays persist in an .npz keyed by the inputs' names, mtimes
+        and sizes, so plot-iteration reruns start parse-free. Otherwise each
+        file parses independently, fanned out across CPUs, and the per-file
+        arrays are merged once at the end.
+        """
+        files = sorted(self.results_dir.glob(pattern))
+        if not files:
+            print(f"No .sca files found in {self.results_dir}")
+            return False
+        cache_path = self._cache_path(files)
+        if cache_path is not None and cache_path.exists():
+            self._load_cache(cache_path)
+            print(f"Loaded {self.files_loaded} result file(s) from cache "
+                  f"({cache_path})")
+            return True
+        if len(files) > 1:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                results = list(ex.map(_parse_sca_file, files, chunksize=4))
+        else:
+            results = [_parse_sca_file(files[0])]
+        self._merge(results)
+        if cache_path is not None:
+            self._save_cache(cache_path)
+        print(f"Loaded {self.files_loaded} result file(s) from {self.results_dir}")
+        return True
+
+    def _all_values(self, metric):
+        """All samples of one metric as a single ndarray (None if absent).
+
+        The SoA layout already keeps each metric's samples contiguous, so
+        this is a zero-copy lookup — no per-plot flatten loops.
+        """
+        entry = self.data.get(metric)
+        return None if entry is None else entry["values"]
+
+    def _per_drone_stats(self, metric):
+        """Grouped per-drone reductions for one metric in O(1) Python calls.
+
+        Sorts the SoA arrays by drone id once, then computes sums, means and
+        stds for every drone with np.add.reduceat (stds via the
+        E[X^2] - E[X]^2 identity). Returns (drone_ids, means, stds, sums),
+        or None if the metric is absent. Results are memoized per metric.
+        """
+        if metric in self._per_drone_cache:
+            return self._per_drone_cache[metric]
+        entry = self.data.get(metric)
+        if entry is None:
+            return None
+        values, drones = entry["values"], entry["drones"]
+        if values.dtype.kind == "i":
+            # Integer count metrics: drone ids index straight into bincount,
+            # no sort needed (float64 weights keep the squares exact).
+            group_sizes = np.bincount(drones)
+            drone_ids = np.nonzero(group_sizes)[0]
+            n = group_sizes[drone_ids]
+            weights = values.astype(np.float64)
+            sums = np.bincount(drones, weights=weights)[drone_ids]
+            means = sums / n
+            mean_sq = np.bincount(drones, weights=weights ** 2)[drone_ids] / n
+            stds = np.sqrt(np.maximum(mean_sq - means ** 2, 0.0))
+            result = (drone_ids, means, stds, sums)
+            self._per_drone_cache[metric] = result
+            return result
+        order = np.argsort(drones, kind="stable")
+        values_sorted = values[order]
+        drones_sorted = drones[order]
+        drone_ids = np.unique(drones_sorted)
+        edges = np.searchsorted(drones_sorted, drone_ids)
+        counts = np.diff(np.append(edges, len(values_sorted)))
+        sums = np.add.reduceat(values_sorted, edges)
+        means = sums / counts
+        mean_sq = np.add.reduceat(values_sorted ** 2, edges) / counts
+        stds = np.sqrt(np.maximum(mean_sq - means ** 2, 0.0))
+        result = (drone_ids, means, stds, sums)
+        self._per_drone_cache[metric] = result
+        return result
+
+    def get_metric_stats(self, metric):
+        """Aggregate statistics for one scalar metric across all drones.
+
+        Memoized per metric name.
+        """
+        if metric in self._stats_cache:
+            return self._stats_cache[metric]
+        values = self._all_values(metric)
+        if values is None:
+            return None
+        # One partition pass covers min/median/max; mean/std/total share the
+        # mean, so the whole summary is two traversals instead of six.
+        vmin, vmedian, vmax = np.percentile(values, [0, 50, 100])
+        mean = values.mean(dtype=np.float64)
+        stats = {
+            "mean": mean,
+            "std": np.sqrt(np.maximum(
+                (values.astype(np.float64) ** 2).mean() - mean ** 2, 0.0)),
+            "min": vmin,
+            "max": vmax,
+            "median": vmedian,
+            "total": mean * len(values),
+            "count": len(values),
+        }
+        self._stats_cache[metric] = stats
+        return stats
+
+    def print_summary(self):
+        """Print a per-metric summary table to stdout."""
+        print("\n" + "=" * 60)
+        print("SWARM PERFORMANCE SUMMARY")
+        print("=" * 60)
+        for metric in (
+            "routeDiscovered:count",
+            "packetRouted:count",
+            "routeDiscovered:sum",
+            "packetRouted:sum",
+        ):
+            stats = self.get_metric_stats(metric)
+            if stats is None:
+                continue
+            print(f"\n{metric}")
+            print(f"  mean   : {stats['mean']:10.2f}")
+            print(f"  std    : {stats['std']:10.2f}")
+            print(f"  median : {stats['median']:10.2f}")
+            print(f"  min/max: {stats['min']:10.2f} / {stats['max']:.2f}")
+            print(f"  total  : {stats['total']:10.2f}  (n={stats['count']})")
+        print("=" * 60)
+
+
+class GraphGenerator:
+    """Renders the analysis graphs from a loaded SimulationAnalyzer."""
+
+    def __init__(self, analyzer, output_dir=OUTPUT_DIR):
+        global plt
+        if plt is None:
+            import matplotlib
+            matplotlib.use("Agg")  # headless, no GUI backend allocations
+            import matplotlib.pyplot as plt
+        self.analyzer = analyzer
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Constrained layout solves the margins algebraically during the
+        # draw; tight_layout needed a full extra draw just to measure text
+        # extents before laying out.
+        plt.rcParams["figure.constrained_layout.use"] = True
+        # One Figure reused for every plot: cleared between plots instead of
+        # allocated/closed each time, so only one canvas is ever resident.
+        self._fig = plt.figure(figsize=FIGURE_SIZE)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _cmap_colors(name, n, lo=0.3, hi=0.9):
+        """RGBA array for n evenly spaced samples of a colormap, cached so
+        repeated plots (and repeated configs) skip the LUT rebuild."""
+        return plt.get_cmap(name)(np.linspace(lo, hi, n))
+
+    def _save(self, output_path):
+        # No bbox_inches="tight": it triggers a second full draw just to
+        # measure the bounding box; constrained layout sets the margins.
+        self._fig.savefig(output_path, dpi=FIGURE_DPI, facecolor="white")
+        print(f"  saved {output_path}")
+
+    def plot_routes_per_drone(self):
+        """Bar chart: average routes discovered per drone (with std)."""
+        stats = self.analyzer._per_drone_stats("routeDiscovered:count")
+        if stats is None:
+            return
+        drone_ids, avg_routes, std_routes, _ = stats
+
+        self._fig.clear()
+        ax = self._fig.add_subplot(111)
+        colors = self._cmap_colors("YlOrRd", len(drone_ids))
+        bars = ax.bar(drone_ids, avg_routes, yerr=std_routes, capsize=4,
+                      color=colors, edgecolor="#7D3C98", linewidth=1.2,
+                      rasterized=True)
+        # bar_label batches the annotation; one Text artist per bar is the
+        # dominant draw cost on big swarms, so skip labels beyond 20 drones.
+        if len(drone_ids) <= 20:
+            ax.bar_label(bars, labels=[f"{v:.1f}" for v in avg_routes],
+                         padding=3, fontsize=10, fontweight="bold")
+        ax.set_xlabel("Drone ID")
+        ax.set_ylabel("Routes discovered (avg per run)")
+        ax.set_title("Route Discovery per Drone")
+        ax.grid(axis="y", alpha=0.3)
+        self._save(self.output_dir / "routes_per_drone.png")
+
+    def plot_route_distribution(self):
+        """Histogram of route-discovery counts across all drones and runs."""
+        all_values = self.analyzer._all_values("routeDiscovered:count")
+        if all_values is None:
+            return
+
+        self._fig.clear()
+        ax = self._fig.add_subplot(111)
+        # One np.histogram pass with colors assigned in bulk, instead of
+        # ax.hist plus a per-patch facecolor loop.
+        counts, edges = np.histogram(all_values, bins=25)
+        widths = np.diff(edges)
+        norm = plt.Normalize(counts.min(), counts.max())
+        colors = plt.cm.Blues(norm(counts))
+        ax.bar(edges[:-1], counts, width=widths, align="edge", color=colors,
+               edgecolor="#1A5276", linewidth=1.5, rasterized=True)
+        ax.set_xlabel("Routes discovered")
+        ax.set_ylabel("Frequency")
+        ax.set_title("Distribution of Route Discoveries")
+        ax.grid(axis="y", alpha=0.3)
+        self._save(self.output_dir / "route_distribution.png")
+
+    def plot_swarm_efficiency(self):
+        """Packets routed per drone, plus swarm-wide totals."""
+        stats = self.analyzer._per_drone_stats("packetRouted:count")
+        if stats is None:
+            return
+        drone_ids, avg_packets, _, totals = stats
+
+        self._fig.clear()
+        ax1, ax2 = self._fig.subplots(1, 2)
+        colors = self._cmap_colors("YlOrRd", len(drone_ids))
+
+        bars = ax1.bar(drone_ids, avg_packets, color=colors,
+                       edgecolor="#7D3C98", linewidth=1.2, rasterized=True)
+        if len(drone_ids) <= 20:
+            ax1.bar_label(bars, labels=[f"{v:.1f}" for v in avg_packets],
+                          padding=3, fontsize=9)
+        ax1.set_xlabel("Drone ID")
+        ax1.set_ylabel("Packets routed (avg per run)")
+        ax1.set_title("Routing Load per Drone")
+        ax1.grid(axis="y", alpha=0.3)
+
+        bars2 = ax2.bar(drone_ids, totals, color=colors,
+                        edgecolor="#1A5276", linewidth=1.2, rasterized=True)
+        if len(drone_ids) <= 20:
+            ax2.bar_label(bars2, labels=[f"{v:.0f}" for v in totals],
+                          padding=3, fontsize=9)
+        ax2.set_xlabel("Drone ID")
+        ax2.set_ylabel("Packets routed (total)")
+        ax2.set_title("Total Routing Contribution")
+        ax2.grid(axis="y", alpha=0.3)
+        self._save(self.output_dir / "swarm_efficiency.png")
+
+    def plot_variability_across_runs(self):
+        """Boxplot: per-drone spread of route discoveries across runs."""
+        entry = self.analyzer.data.get("routeDiscovered:count")
+        if entry is None:
+            return
+        values, drones = entry["values"], entry["drones"]
+        # Sort by drone once and feed ax.bxp precomputed statistics over
+        # zero-copy group views, instead of handing ax.boxplot a list of
+        # per-drone copies that it re-sorts internally.
+        order = np.argsort(drones, kind="stable")
+        values_sorted = values[order]
+        drones_sorted = drones[order]
+        drone_ids, counts = np.unique(drones_sorted, return_counts=True)
+        edges = np.searchsorted(drones_sorted, drone_ids)
+        if counts.min() == counts.max():
+            # Uniform group sizes (the usual case: one sample per run):
+            # all percentiles/means in single vectorized axis-1 reductions.
+            mat = values_sorted.reshape(len(drone_ids), -1)
+            q1, med, q3 = np.percentile(mat, [25, 50, 75], axis=1)
+            means = mat.mean(axis=1)
+            iqr = q3 - q1
+            whislo = np.where(mat >= (q1 - 1.5 * iqr)[:, None],
+                              mat, np.inf).min(axis=1)
+            whishi = np.where(mat <= (q3 + 1.5 * iqr)[:, None],
+                              mat, -np.inf).max(axis=1)
+            groups = mat
+        else:
+            groups = np.split(values_sorted, edges[1:])
+            q1, med, q3, means, whislo, whishi = (
+                np.empty(len(groups)) for _ in range(6))
+            for i, g in enumerate(groups):
+                q1[i], med[i], q3[i] = np.percentile(g, [25, 50, 75])
+                means[i] = g.mean()
+                iqr = q3[i] - q1[i]
+                whislo[i] = g[g >= q1[i] - 1.5 * iqr].min()
+                whishi[i] = g[g <= q3[i] + 1.5 * iqr].max()
+        fliers = [g[(g < lo) | (g > hi)]
+                  for g, lo, hi in zip(groups, whislo, whishi)]
+
+        self._fig.clear()
+        ax = self._fig.add_subplot(111)
+        # Draw the whole boxplot as three artists — one PolyCollection for
+        # the boxes and one LineCollection each for medians and
+        # whiskers/caps — instead of ax.bxp's five-plus artists per drone.
+        from matplotlib.collections import LineCollection, PolyCollection
+
+        x = np.arange(1, len(drone_ids) + 1, dtype=np.float64)
+        half, cap_half = 0.25, 0.125
+        verts = np.empty((len(x), 4, 2))
+        verts[:, 0, 0] = x - half
+        verts[:, 1, 0] = x + half
+        verts[:, 2, 0] = x + half
+        verts[:, 3, 0] = x - half
+        verts[:, 0, 1] = q1
+        verts[:, 1, 1] = q1
+        verts[:, 2, 1] = q3
+        verts[:, 3, 1] = q3
+        colors = self._cmap_colors("YlOrRd", len(drone_ids))
+        ax.add_collection(PolyCollection(
+            verts, facecolors=colors, edgecolors="black", linewidths=1.0,
+            rasterized=True, zorder=2))
+
+        med_segs = np.empty((len(x), 2, 2))
+        med_segs[:, 0, 0] = x - half
+        med_segs[:, 1, 0] = x + half
+        med_segs[:, :, 1] = med[:, None]
+        ax.add_collection(LineCollection(
+            med_segs, colors="firebrick", linewidths=1.5, rasterized=True,
+            zorder=3))
+
+        stem_x = np.tile(x, 2)
+        stems = np.empty((4 * len(x), 2, 2))
+        stems[:2 * len(x), 0, 0] = stem_x
+        stems[:2 * len(x), 1, 0] = stem_x
+        stems[:len(x), 0, 1] = q3
+        stems[:len(x), 1, 1] = whishi
+        stems[len(x):2 * len(x), 0, 1] = q1
+        stems[len(x):2 * len(x), 1, 1] = whislo
+        stems[2 * len(x):, 0, 0] = np.tile(x - cap_half, 2)
+        stems[2 * len(x):, 1, 0] = np.tile(x + cap_half, 2)
+        stems[2 * len(x):3 * len(x), :, 1] = whishi[:, None]
+        stems[3 * len(x):, :, 1] = whislo[:, None]
+        ax.add_collection(LineCollection(
+            stems, colors="black", linewidths=1.0, rasterized=True, zorder=2))
+
+        ax.plot(x, means, linestyle="none", marker="^", markersize=6,
+                markerfacecolor="green", markeredgecolor="black", zorder=4)
+        flier_x = np.repeat(x, [len(f) for f in fliers])
+        if len(flier_x):
+            ax.plot(flier_x, np.concatenate(fliers), linestyle="none",
+                    marker="o", markersize=4, markerfacecolor="none",
+                    markeredgecolor="black", zorder=4)
+
+        ax.set_xticks(x)
+        ax.set_xticklabels(drone_ids)
+        ax.set_xlim(0.5, len(x) + 0.5)
+        lo = min(values_sorted.min(), whislo.min())
+        hi = max(values_sorted.max(), whishi.max())
+        margin = 0.05 * (hi - lo or 1.0)
+        ax.set_ylim(lo - margin, hi + margin)
+        ax.set_xlabel("Drone ID")
+        ax.set_ylabel("Routes discovered")
+        ax.set_title("Run-to-Run Variability per Drone")
+        ax.grid(axis="y", alpha=0.3)
+        self._save(self.output_dir / "variability_across_runs.png")
+
+    def plot_performance_heatmap(self):
+        """Heatmap: routes discovered per drone (rows) per run (columns)."""
+        entry = self.analyzer.data.get("routeDiscovered:count")
+        if entry is None:
+            return
+        values, drones = entry["values"], entry["drones"]
+        # Fill the (drone, run) matrix with one advanced-indexing assignment:
+        # sort by drone, derive each sample's row from its drone id and its
+        # column from its position within the drone's run sequence.
+        order = np.argsort(drones, kind="stable")
+        drones_sorted = drones[order]
+        values_sorted = values[order]
+        drone_ids, counts = np.unique(drones_sorted, return_counts=True)
+        edges = np.searchsorted(drones_sorted, drone_ids)
+        rows = np.searchsorted(drone_ids, drones_sorted)
+        cols = np.arange(len(drones_sorted)) - np.repeat(edges, counts)
+        max_runs = int(counts.max())
+        matrix = np.zeros((len(drone_ids), max_runs), dtype=np.float32)
+        matrix[rows, cols] = values_sorted
+
+        self._fig.clear()
+        ax = self._fig.add_subplot(111)
+        im = ax.imshow(matrix, cmap="YlOrRd", aspect="auto", rasterized=True)
+        # Cell annotations are individual Text artists; only draw them for
+        # the populated cells, and not at all once the grid gets dense.
+        if matrix.size <= 200:
+            for i, j, value in zip(rows, cols, values_sorted):
+                ax.text(j, i, f"{value:.0f}", ha="center", va="center",
+                        fontsize=8)
+        ax.set_xticks(range(max_runs))
+        ax.set_xticklabels([f"run {j}" for j in range(max_runs)])
+        ax.set_yticks(range(len(drone_ids)))
+        ax.set_yticklabels([f"drone[{d}]" for d in drone_ids])
+        ax.set_xlabel("Simulation run")
+        ax.set_ylabel("Drone")
+        ax.set_title("Route Discovery Heatmap")
+        self._fig.colorbar(im, ax=ax, label="Routes discovered")
+        self._save(self.output_dir / "performance_heatmap.png")
+
+    def generate_all_plots(self):
+        print("\nGenerating graphs...")
+        for plot in (
+            self.plot_routes_per_drone,
+            self.plot_route_distribution,
+            self.plot_swarm_efficiency,
+            self.plot_variability_across_runs,
+            self.plot_performance_heatmap,
+        ):
+            plot()
+            # Matplotlib keeps internal references alive after savefig; a
+            # collect here releases each plot's artists before the next one.
+            gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analyze OMNeT++ .sca results from the drone swarm simulation")
+    parser.add_argument("--results-dir", default=RESULTS_DIR,
+                        help=f"directory with .sca files (default: {RESULTS_DIR})")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help=f"directory for generated PNGs (default: {OUTPUT_DIR})")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="print the summary only, skip graph generation")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always re-parse .sca files, ignore the "
+                             "parsed-array cache")
+    args = parser.parse_args()
+
+    cache_dir = None if args.no_cache else Path(args.output_dir) / ".cache"
+    analyzer = SimulationAnalyzer(args.results_dir, cache_dir=cache_dir)
+    if not analyzer.load_all_sca_files():
+        sys.exit(1)
+    analyzer.print_summary()
+
+    if not args.no_plots:
+        generator = GraphGenerator(analyzer, args.output_dir)
+        generator.generate_all_plots()
+
+
+if __name__ == "__main__":
+    main()